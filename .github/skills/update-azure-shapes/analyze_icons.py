@@ -11,25 +11,86 @@ Usage:
     python analyze_icons.py
 """
 
+import ast
 import json
+import os
 import sys
+import urllib.error
 import urllib.request
 from pathlib import Path
 
+# Local cache for GitHub API responses, revalidated with ETags
+CACHE_DIR = Path.home() / '.cache' / 'azure-drawio-mcp'
+
+
+def fetch_github_json(url, cache_name):
+    """Fetch JSON from the GitHub API, reusing the cached copy if unchanged.
+    
+    The response body and its ETag are stored under CACHE_DIR. Later calls
+    send If-None-Match, and a 304 Not Modified answer is served from the
+    cache. Set GITHUB_TOKEN to lift the anonymous rate limit.
+    """
+    body_file = CACHE_DIR / f'{cache_name}.json'
+    etag_file = CACHE_DIR / f'{cache_name}.etag'
+    
+    headers = {'Accept': 'application/vnd.github+json'}
+    token = os.environ.get('GITHUB_TOKEN')
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    if body_file.exists() and etag_file.exists():
+        headers['If-None-Match'] = etag_file.read_text().strip()
+    
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+            etag = response.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return json.loads(body_file.read_bytes())
+        raise
+    
+    if etag:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            body_file.write_bytes(body)
+            etag_file.write_text(etag)
+        except OSError:
+            pass  # Caching is best-effort
+    
+    return json.loads(body)
+
 
 def fetch_drawio_icons():
-    """Fetch list of Azure2 icons from DrawIO GitHub repository."""
-    url = 'https://api.github.com/repos/jgraph/drawio/git/trees/dev?recursive=1'
+    """Fetch list of Azure2 icons from DrawIO GitHub repository.
+    
+    Resolves the tree SHA of the azure2 directory from its parent's listing
+    and fetches only that subtree, which is far smaller than the full
+    repository tree and stays clear of GitHub's truncation limit.
+    """
+    api = 'https://api.github.com/repos/jgraph/drawio'
+    parent_dir, icons_dir = 'src/main/webapp/img/lib', 'azure2'
+    
+    listing = fetch_github_json(f'{api}/contents/{parent_dir}?ref=dev', 'drawio-lib-contents')
+    tree_sha = next(
+        (entry['sha'] for entry in listing
+         if entry['name'] == icons_dir and entry['type'] == 'dir'),
+        None,
+    )
+    if tree_sha is None:
+        print(f"\n❌ ERROR: Directory '{parent_dir}/{icons_dir}' not found in jgraph/drawio (dev).")
+        print("The DrawIO icon library may have been renamed or moved.")
+        sys.exit(1)
     
-    with urllib.request.urlopen(url) as response:
-        data = json.loads(response.read())
+    data = fetch_github_json(f'{api}/git/trees/{tree_sha}?recursive=1', 'drawio-azure2-tree')
+    if data.get('truncated'):
+        print("WARNING: GitHub truncated the azure2 tree; some icons may be missing")
     
-    icons = []
-    for item in data['tree']:
-        path = item['path']
-        if 'src/main/webapp/img/lib/azure2/' in path and path.endswith('.svg'):
-            rel_path = path.replace('src/main/webapp/img/lib/azure2/', '')
-            icons.append(rel_path)
+    # Paths are already relative to the azure2 directory
+    icons = [
+        item['path'] for item in data['tree']
+        if item['type'] == 'blob' and item['path'].endswith('.svg')
+    ]
     
     return sorted(icons)
 
@@ -50,39 +111,46 @@ def load_current_shapes():
 
 def check_for_duplicates():
     """Check azure_shapes.py source file for duplicate keys."""
-    import re
-    
     shapes_file = Path(__file__).parent.parent.parent.parent / 'azure_drawio_mcp_server' / 'azure_shapes.py'
     
-    with open(shapes_file, 'r') as f:
-        lines = f.readlines()
+    tree = ast.parse(shapes_file.read_text(encoding='utf-8'))
+    
+    # Find the AZURE_SHAPES dictionary literal (plain or annotated assignment)
+    shapes_dict = None
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign):
+            targets = [node.target]
+        else:
+            continue
+        if any(isinstance(t, ast.Name) and t.id == 'AZURE_SHAPES' for t in targets):
+            if isinstance(node.value, ast.Dict):
+                shapes_dict = node.value
+            break
+    
+    if shapes_dict is None:
+        return []
     
     seen_keys = {}
     duplicates = []
-    in_dict = False
     
-    for line_num, line in enumerate(lines, start=1):
-        # Detect start of AZURE_SHAPES dictionary
-        if 'AZURE_SHAPES' in line and '= {' in line:
-            in_dict = True
+    # The AST keeps every key, so duplicates silently dropped at runtime are still visible
+    for key, value in zip(shapes_dict.keys, shapes_dict.values):
+        if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
             continue
         
-        # Detect end of dictionary
-        if in_dict and line.strip() == '}':
-            break
+        # Match pattern: 'Key': ('Name', 'category', 'path.svg'),
+        icon_path = None
+        if isinstance(value, ast.Tuple) and len(value.elts) >= 3:
+            icon_node = value.elts[2]
+            if isinstance(icon_node, ast.Constant):
+                icon_path = icon_node.value
         
-        # Parse shape definitions
-        if in_dict and ':' in line and not line.strip().startswith('#'):
-            # Match pattern: 'Key': ('Name', 'category', 'path.svg'),
-            match = re.match(r"\s*'([^']+)':\s*\([^,]+,\s*'[^']+',\s*'([^']+)'\)", line)
-            if match:
-                key = match.group(1)
-                icon_path = match.group(2)
-                
-                if key in seen_keys:
-                    duplicates.append((key, seen_keys[key], (line_num, icon_path)))
-                else:
-                    seen_keys[key] = (line_num, icon_path)
+        if key.value in seen_keys:
+            duplicates.append((key.value, seen_keys[key.value], (key.lineno, icon_path)))
+        else:
+            seen_keys[key.value] = (key.lineno, icon_path)
     
     return duplicates
 
@@ -139,12 +207,13 @@ def main():
     
     if removed_icons:
         print(f"\nWARNING: Icons in azure_shapes.py not in DrawIO ({len(removed_icons)} total):")
+        # Map each icon path to the first shape that uses it
+        path_to_key = {}
+        for key, (display_name, category, path) in shapes_dict.items():
+            if path:
+                path_to_key.setdefault(path, key)
         for icon_path in removed_icons:
-            # Find which shape uses this
-            for key, (display_name, category, path) in shapes_dict.items():
-                if path == icon_path:
-                    print(f"  {icon_path:50s} (used by {key})")
-                    break
+            print(f"  {icon_path:50s} (used by {path_to_key[icon_path]})")
 
 
 if __name__ == '__main__':
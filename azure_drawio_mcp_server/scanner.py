@@ -8,13 +8,22 @@ Supports:
 - Azure SDK usage in code (*.cs, *.py, *.js, *.ts)
 """
 
+import asyncio
+import bisect
+import hashlib
+import itertools
 import os
 import re
 import json
 import logging
+import mmap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
-from dataclasses import dataclass, field
+from typing import AbstractSet, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass, field, replace
 
 logger = logging.getLogger(__name__)
 
@@ -181,47 +190,237 @@ TERRAFORM_RESOURCE_MAP = {
     'azurerm_synapse_workspace': 'Synapse',
 }
 
-# Azure SDK patterns for detecting resources in code
-SDK_PATTERNS = {
+# Azure SDK patterns for detecting resources in code, as (pattern, type) pairs
+SDK_PATTERNS: List[Tuple[str, str]] = [
     # .NET Azure SDK
-    r'BlobServiceClient|BlobContainerClient': 'BlobStorage',
-    r'CosmosClient|CosmosDatabase': 'CosmosDB',
-    r'KeyVaultClient|SecretClient|KeyClient': 'KeyVault',
-    r'ServiceBusClient|ServiceBusSender': 'ServiceBus',
-    r'EventHubProducerClient|EventHubConsumerClient': 'EventHub',
-    r'SearchClient|SearchIndexClient': 'AISearch',
-    r'OpenAIClient|ChatCompletionsClient': 'AzureOpenAI',
-    r'SqlConnection.*\.database\.windows\.net': 'SQLDatabase',
-    r'RedisConnection|StackExchange\.Redis': 'Redis',
-    r'TableServiceClient|TableClient': 'TableStorage',
-    r'QueueServiceClient|QueueClient': 'QueueStorage',
+    (r'BlobServiceClient|BlobContainerClient', 'BlobStorage'),
+    (r'CosmosClient|CosmosDatabase', 'CosmosDB'),
+    (r'KeyVaultClient|SecretClient|KeyClient', 'KeyVault'),
+    (r'ServiceBusClient|ServiceBusSender', 'ServiceBus'),
+    (r'EventHubProducerClient|EventHubConsumerClient', 'EventHub'),
+    (r'SearchClient|SearchIndexClient', 'AISearch'),
+    (r'OpenAIClient|ChatCompletionsClient', 'AzureOpenAI'),
+    (r'SqlConnection.*\.database\.windows\.net', 'SQLDatabase'),
+    (r'RedisConnection|StackExchange\.Redis', 'Redis'),
+    (r'TableServiceClient|TableClient', 'TableStorage'),
+    (r'QueueServiceClient|QueueClient', 'QueueStorage'),
     
     # Python Azure SDK
-    r'BlobServiceClient|ContainerClient': 'BlobStorage',
-    r'CosmosClient': 'CosmosDB',
-    r'SecretClient|KeyClient|CertificateClient': 'KeyVault',
-    r'ServiceBusClient': 'ServiceBus',
-    r'EventHubProducerClient|EventHubConsumerClient': 'EventHub',
-    r'SearchClient': 'AISearch',
-    r'AzureOpenAI|AsyncAzureOpenAI': 'AzureOpenAI',
+    (r'BlobServiceClient|ContainerClient', 'BlobStorage'),
+    (r'CosmosClient', 'CosmosDB'),
+    (r'SecretClient|KeyClient|CertificateClient', 'KeyVault'),
+    (r'ServiceBusClient', 'ServiceBus'),
+    (r'SearchClient', 'AISearch'),
+    (r'AzureOpenAI|AsyncAzureOpenAI', 'AzureOpenAI'),
     
     # Connection strings
-    r'AccountName=\w+;.*BlobEndpoint': 'StorageAccount',
-    r'\.blob\.core\.windows\.net': 'BlobStorage',
-    r'\.table\.core\.windows\.net': 'TableStorage',
-    r'\.queue\.core\.windows\.net': 'QueueStorage',
-    r'\.servicebus\.windows\.net': 'ServiceBus',
-    r'\.documents\.azure\.com': 'CosmosDB',
-    r'\.vault\.azure\.net': 'KeyVault',
-    r'\.database\.windows\.net': 'SQLDatabase',
-    r'\.redis\.cache\.windows\.net': 'Redis',
-    r'\.search\.windows\.net': 'AISearch',
-    r'\.openai\.azure\.com': 'AzureOpenAI',
-    r'\.cognitiveservices\.azure\.com': 'CognitiveServices',
-    r'\.signalr\.net': 'SignalR',
-    r'\.azurewebsites\.net': 'AppService',
-    r'\.azurecr\.io': 'ACR',
-}
+    (r'AccountName=\w+;.*BlobEndpoint', 'StorageAccount'),
+    (r'\.blob\.core\.windows\.net', 'BlobStorage'),
+    (r'\.table\.core\.windows\.net', 'TableStorage'),
+    (r'\.queue\.core\.windows\.net', 'QueueStorage'),
+    (r'\.servicebus\.windows\.net', 'ServiceBus'),
+    (r'\.documents\.azure\.com', 'CosmosDB'),
+    (r'\.vault\.azure\.net', 'KeyVault'),
+    (r'\.database\.windows\.net', 'SQLDatabase'),
+    (r'\.redis\.cache\.windows\.net', 'Redis'),
+    (r'\.search\.windows\.net', 'AISearch'),
+    (r'\.openai\.azure\.com', 'AzureOpenAI'),
+    (r'\.cognitiveservices\.azure\.com', 'CognitiveServices'),
+    (r'\.signalr\.net', 'SignalR'),
+    (r'\.azurewebsites\.net', 'AppService'),
+    (r'\.azurecr\.io', 'ACR'),
+]
+
+# Each pattern must appear once; repeated entries are what silently collided
+# back when SDK_PATTERNS was a dict
+assert len({pattern for pattern, _ in SDK_PATTERNS}) == len(SDK_PATTERNS), \
+    "SDK_PATTERNS contains duplicate patterns"
+
+# IaC files are memory-mapped and matched as bytes; larger files are skipped
+MAX_IAC_FILE_BYTES = 8 * 1024 * 1024
+
+# Bicep resource declarations: resource <name> '<type>@<version>' = {
+_BICEP_RESOURCE_RE = re.compile(rb"resource\s+(\w+)\s+'([^']+)@[^']+'\s*=", re.MULTILINE)
+_BICEP_NAME_RE = re.compile(rb"name:\s*'([^']+)'")
+
+# Terraform resource blocks: resource "azurerm_xxx" "name" {
+_TF_RESOURCE_RE = re.compile(rb'resource\s+"(azurerm_\w+)"\s+"(\w+)"\s*\{', re.MULTILINE)
+_TF_NAME_RE = re.compile(rb'name\s*=\s*"([^"]+)"')
+
+
+def _split_sdk_patterns(
+    patterns: List[Tuple[str, str]],
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """Split SDK patterns into lowercase fixed strings and true regexes.
+    
+    A pattern counts as fixed when every ``|`` alternative is plain text once
+    its backslash escapes are removed (e.g. ``\\.vault\\.azure\\.net``).
+    """
+    literals: Dict[Tuple[str, str], None] = {}
+    regexes: List[Tuple[str, str]] = []
+    for pattern, resource_type in patterns:
+        alternatives = pattern.split('|')
+        unescaped = [re.sub(r'\\(.)', r'\1', alt) for alt in alternatives]
+        if all(re.escape(text) == alt for text, alt in zip(unescaped, alternatives)):
+            for text in unescaped:
+                literals[(text.lower(), resource_type)] = None
+        else:
+            regexes.append((pattern, resource_type))
+    return list(literals), regexes
+
+
+# Fixed strings are matched with plain substring search on the lowercased
+# file, leaving only the few real regexes for the regex engine
+_SDK_LITERALS, _sdk_regex_patterns = _split_sdk_patterns(SDK_PATTERNS)
+
+
+def _required_tail(pattern: str) -> Optional[str]:
+    """Return the lowercase literal a pattern must end with after its last ``.*``, if any."""
+    tail = pattern.rsplit('.*', 1)[-1]
+    text = re.sub(r'\\(.)', r'\1', tail)
+    return text.lower() if tail and re.escape(text) == tail else None
+
+
+# Remaining SDK regexes, compiled once and searched individually so a regex is
+# never run for a type that has already been detected. Each is only searched
+# when its literal tail occurs in the file, so a bundle with many partial
+# matches (e.g. repeated SqlConnection) is not rescanned to the end of the line.
+_SDK_REGEXES = [
+    (re.compile(pattern, re.IGNORECASE), _required_tail(pattern), resource_type)
+    for pattern, resource_type in _sdk_regex_patterns
+]
+
+# Code file extensions scanned for Azure SDK usage
+CODE_EXTENSIONS = ('.cs', '.py', '.js', '.ts', '.java')
+
+# Leading bytes of a JSON file inspected to decide whether it is an ARM template
+ARM_PROBE_BYTES = 4096
+
+# Directories that are never descended into while scanning
+SKIP_DIRS = frozenset({
+    'node_modules', '.git', '.venv', 'venv', '__pycache__',
+    'bin', 'obj', 'dist', 'build', '.terraform', '.next',
+})
+
+# Common connection patterns used to infer links between discovered resources
+CONNECTION_RULES: List[Tuple[str, str, str]] = [
+    # (source_type, target_type, label)
+    ('AppService', 'SQLDatabase', 'Database'),
+    ('AppService', 'CosmosDB', 'Database'),
+    ('AppService', 'Redis', 'Cache'),
+    ('AppService', 'KeyVault', 'Secrets'),
+    ('AppService', 'StorageAccount', 'Storage'),
+    ('AppService', 'BlobStorage', 'Blobs'),
+    ('AppService', 'ApplicationInsights', 'Telemetry'),
+    ('FunctionApp', 'SQLDatabase', 'Database'),
+    ('FunctionApp', 'CosmosDB', 'Database'),
+    ('FunctionApp', 'KeyVault', 'Secrets'),
+    ('FunctionApp', 'StorageAccount', 'Storage'),
+    ('FunctionApp', 'ServiceBus', 'Messages'),
+    ('FunctionApp', 'EventHub', 'Events'),
+    ('FunctionApp', 'EventGrid', 'Events'),
+    ('FunctionApp', 'ApplicationInsights', 'Telemetry'),
+    ('AKS', 'ACR', 'Pull Images'),
+    ('AKS', 'KeyVault', 'Secrets'),
+    ('AKS', 'SQLDatabase', 'Database'),
+    ('AKS', 'CosmosDB', 'Database'),
+    ('AKS', 'ApplicationInsights', 'Telemetry'),
+    ('APIM', 'AppService', 'Backend'),
+    ('APIM', 'FunctionApp', 'Backend'),
+    ('APIM', 'AKS', 'Backend'),
+    ('ApplicationGateway', 'AppService', 'Route'),
+    ('ApplicationGateway', 'AKS', 'Route'),
+    ('FrontDoor', 'AppService', 'Origin'),
+    ('FrontDoor', 'ApplicationGateway', 'Origin'),
+    ('LoadBalancer', 'VM', 'Balance'),
+    ('LoadBalancer', 'VMSS', 'Balance'),
+    ('PrivateEndpoint', 'SQLDatabase', 'Private Link'),
+    ('PrivateEndpoint', 'StorageAccount', 'Private Link'),
+    ('PrivateEndpoint', 'KeyVault', 'Private Link'),
+    ('PrivateEndpoint', 'CosmosDB', 'Private Link'),
+    ('LogicApp', 'ServiceBus', 'Messages'),
+    ('LogicApp', 'EventGrid', 'Events'),
+    ('DataFactory', 'SQLDatabase', 'Source/Sink'),
+    ('DataFactory', 'BlobStorage', 'Source/Sink'),
+    ('DataFactory', 'Synapse', 'Analytics'),
+    ('StreamAnalytics', 'EventHub', 'Input'),
+    ('StreamAnalytics', 'IoTHub', 'Input'),
+    ('StreamAnalytics', 'CosmosDB', 'Output'),
+    ('StreamAnalytics', 'SQLDatabase', 'Output'),
+]
+
+
+# A resource found while parsing one file: (resource_type, name, source_file, line_number)
+_Finding = Tuple[str, str, str, Optional[int]]
+
+# File content as raw bytes, either read or memory-mapped
+_Buffer = Union[bytes, mmap.mmap]
+
+# Resources and connections returned by a workspace scan
+_ScanResult = Tuple[List[DiscoveredResource], List[Tuple[str, str, str]]]
+
+
+@contextmanager
+def _map_file(path: Path) -> Iterator[_Buffer]:
+    """Memory-map a file read-only, yielding empty bytes for empty or oversized files."""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            yield b''
+        elif size > MAX_IAC_FILE_BYTES:
+            logger.warning(f"Skipping {path}: larger than {MAX_IAC_FILE_BYTES} bytes")
+            yield b''
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+
+def _decode(value: bytes) -> str:
+    """Decode a captured group from a bytes regex match."""
+    return value.decode('utf-8', errors='replace')
+
+
+def _line_starts(content: _Buffer) -> List[int]:
+    """Return the offset at which each line of ``content`` starts."""
+    starts = [0]
+    pos = content.find(b'\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = content.find(b'\n', pos + 1)
+    return starts
+
+
+def _line_of(offset: int, line_starts: List[int]) -> int:
+    """Return the 1-based line number containing ``offset``."""
+    return bisect.bisect_right(line_starts, offset)
+
+
+def _files_signature(root: Path, paths: Iterable[Path]) -> bytes:
+    """Digest the path, size and mtime of each file to detect workspace changes.
+    
+    Paths are hashed relative to ``root`` so the digest does not depend on
+    how the workspace directory was spelled.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        digest.update(os.fsencode(os.path.relpath(path, root)))
+        try:
+            st = path.stat()
+            digest.update(f"\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+        except OSError:
+            digest.update(b"\0\n")
+    return digest.digest()
+
+
+def _copy_resources(resources: Iterable[DiscoveredResource]) -> List[DiscoveredResource]:
+    """Copy resources so cached scan results are never shared with callers."""
+    return [replace(res, connections=list(res.connections)) for res in resources]
+
+
+# Recent scan results keyed by (workspace_dir, files signature), oldest first
+_SCAN_CACHE: "OrderedDict[Tuple[str, bytes], _ScanResult]" = OrderedDict()
+_SCAN_CACHE_SIZE = 4
+_SCAN_CACHE_LOCK = threading.Lock()
 
 
 class WorkspaceScanner:
@@ -232,6 +431,8 @@ class WorkspaceScanner:
         self.resources: Dict[str, DiscoveredResource] = {}
         self.connections: List[Tuple[str, str, str]] = []  # (source, target, label)
         self._resource_counter = 0
+        self._by_name_type: Dict[Tuple[str, str], str] = {}  # (name, type) -> id
+        self._relpath_cache: Dict[str, str] = {}  # source file -> workspace-relative path
     
     def _generate_id(self, prefix: str) -> str:
         """Generate a unique ID for a resource."""
@@ -248,12 +449,16 @@ class WorkspaceScanner:
     ) -> str:
         """Add a discovered resource and return its ID."""
         # Check for duplicates by name and type
-        for res_id, res in self.resources.items():
-            if res.name == name and res.resource_type == resource_type:
-                return res_id
+        key = (name, resource_type)
+        existing_id = self._by_name_type.get(key)
+        if existing_id:
+            return existing_id
         
         res_id = self._generate_id(resource_type.lower())
-        rel_path = str(Path(source_file).relative_to(self.workspace_dir))
+        rel_path = self._relpath_cache.get(source_file)
+        if rel_path is None:
+            rel_path = os.path.relpath(source_file, self.workspace_dir)
+            self._relpath_cache[source_file] = rel_path
         
         self.resources[res_id] = DiscoveredResource(
             id=res_id,
@@ -264,6 +469,7 @@ class WorkspaceScanner:
             group=group,
             rationale=f"Discovered in {rel_path}" + (f":{line_number}" if line_number else ""),
         )
+        self._by_name_type[key] = res_id
         return res_id
     
     def scan(self) -> Tuple[List[DiscoveredResource], List[Tuple[str, str, str]]]:
@@ -277,221 +483,232 @@ class WorkspaceScanner:
             logger.warning(f"Workspace directory does not exist: {self.workspace_dir}")
             return [], []
         
-        # Scan different file types
-        self._scan_bicep_files()
-        self._scan_terraform_files()
-        self._scan_arm_templates()
-        self._scan_code_files()
+        # Dispatch table from file extension to per-file scanner
+        handlers: Dict[str, Callable[[Path], List[_Finding]]] = {
+            '.bicep': self._scan_bicep_file,
+            '.tf': self._scan_terraform_file,
+            '.json': self._scan_arm_template,
+        }
+        for ext in CODE_EXTENSIONS:
+            handlers[ext] = self._scan_code_file
+        
+        # Collect files in a single walk, then scan IaC before code so
+        # IaC definitions take precedence in duplicate detection
+        files_by_ext: Dict[str, List[Path]] = {ext: [] for ext in handlers}
+        for path, ext in self._iter_files(files_by_ext.keys()):
+            files_by_ext[ext].append(path)
+        
+        # Reuse the previous result if no scanned file was added, removed or modified
+        cache_key = (
+            os.path.abspath(self.workspace_dir),
+            _files_signature(
+                self.workspace_dir,
+                itertools.chain.from_iterable(files_by_ext.values()),
+            ),
+        )
+        with _SCAN_CACHE_LOCK:
+            cached = _SCAN_CACHE.get(cache_key)
+            if cached is not None:
+                _SCAN_CACHE.move_to_end(cache_key)
+        if cached is not None:
+            resources, connections = cached
+            self.resources = {res.id: res for res in _copy_resources(resources)}
+            self.connections = list(connections)
+            return list(self.resources.values()), list(self.connections)
+        
+        jobs = [
+            (handler, path)
+            for ext, handler in handlers.items()
+            for path in files_by_ext[ext]
+        ]
+        
+        # Parse files concurrently; results come back in job order and are
+        # merged on this thread so resource bookkeeping needs no locking
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for findings in executor.map(lambda job: job[0](job[1]), jobs):
+                for resource_type, name, source_file, line_number in findings:
+                    self._add_resource(resource_type, name, source_file, line_number)
         
         # Infer connections based on common patterns
         self._infer_connections()
         
-        return list(self.resources.values()), self.connections
+        with _SCAN_CACHE_LOCK:
+            _SCAN_CACHE[cache_key] = (
+                _copy_resources(self.resources.values()),
+                list(self.connections),
+            )
+            while len(_SCAN_CACHE) > _SCAN_CACHE_SIZE:
+                _SCAN_CACHE.popitem(last=False)
+        
+        return list(self.resources.values()), list(self.connections)
     
-    def _scan_bicep_files(self) -> None:
-        """Scan Bicep files for resource definitions."""
-        for bicep_file in self.workspace_dir.rglob('*.bicep'):
-            if self._should_skip(bicep_file):
-                continue
-            
-            try:
-                content = bicep_file.read_text(encoding='utf-8')
-                self._parse_bicep(content, str(bicep_file))
-            except Exception as e:
-                logger.warning(f"Error parsing Bicep file {bicep_file}: {e}")
+    def _iter_files(self, extensions: AbstractSet[str]) -> Iterator[Tuple[Path, str]]:
+        """Walk the workspace once, yielding (path, extension) for matching files.
+        
+        Skipped directories (node_modules, .git, etc.) are pruned so they are
+        never descended into, and Path objects are only built for files whose
+        extension is in ``extensions``.
+        """
+        for dirpath, dirnames, filenames in os.walk(self.workspace_dir):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            for filename in sorted(filenames):
+                ext = os.path.splitext(filename)[1]
+                if ext in extensions:
+                    yield Path(dirpath, filename), ext
     
-    def _parse_bicep(self, content: str, file_path: str) -> None:
+    def _scan_bicep_file(self, bicep_file: Path) -> List[_Finding]:
+        """Scan a Bicep file for resource definitions."""
+        try:
+            with _map_file(bicep_file) as content:
+                return self._parse_bicep(content, str(bicep_file))
+        except Exception as e:
+            logger.warning(f"Error parsing Bicep file {bicep_file}: {e}")
+            return []
+    
+    def _parse_bicep(self, content: _Buffer, file_path: str) -> List[_Finding]:
         """Parse Bicep content for resource definitions."""
-        # Match resource declarations: resource <name> '<type>@<version>' = {
-        resource_pattern = r"resource\s+(\w+)\s+'([^']+)@[^']+'\s*="
+        findings: List[_Finding] = []
+        line_starts = _line_starts(content)
         
-        for match in re.finditer(resource_pattern, content, re.MULTILINE):
-            bicep_name = match.group(1)
-            resource_type = match.group(2).lower()
-            line_num = content[:match.start()].count('\n') + 1
+        for match in _BICEP_RESOURCE_RE.finditer(content):
+            bicep_name = _decode(match.group(1))
+            resource_type = _decode(match.group(2)).lower()
+            line_num = _line_of(match.start(), line_starts)
             
-            if resource_type in AZURE_RESOURCE_TYPE_MAP:
-                diagram_type = AZURE_RESOURCE_TYPE_MAP[resource_type]
+            diagram_type = AZURE_RESOURCE_TYPE_MAP.get(resource_type)
+            if diagram_type:
                 # Try to extract a display name from the resource definition
                 name = self._extract_bicep_name(content, match.end(), bicep_name)
-                self._add_resource(diagram_type, name, file_path, line_num)
+                findings.append((diagram_type, name, file_path, line_num))
+        
+        return findings
     
-    def _extract_bicep_name(self, content: str, start_pos: int, fallback: str) -> str:
+    def _extract_bicep_name(self, content: _Buffer, start_pos: int, fallback: str) -> str:
         """Extract the name property from a Bicep resource definition."""
         # Look for name: '...' or name: concat(...) within the next 500 chars
         search_region = content[start_pos:start_pos + 500]
-        name_match = re.search(r"name:\s*'([^']+)'", search_region)
+        name_match = _BICEP_NAME_RE.search(search_region)
         if name_match:
-            return name_match.group(1)
+            return _decode(name_match.group(1))
         return fallback.replace('_', ' ').title()
     
-    def _scan_terraform_files(self) -> None:
-        """Scan Terraform files for Azure resource definitions."""
-        for tf_file in self.workspace_dir.rglob('*.tf'):
-            if self._should_skip(tf_file):
-                continue
-            
-            try:
-                content = tf_file.read_text(encoding='utf-8')
-                self._parse_terraform(content, str(tf_file))
-            except Exception as e:
-                logger.warning(f"Error parsing Terraform file {tf_file}: {e}")
+    def _scan_terraform_file(self, tf_file: Path) -> List[_Finding]:
+        """Scan a Terraform file for Azure resource definitions."""
+        try:
+            with _map_file(tf_file) as content:
+                return self._parse_terraform(content, str(tf_file))
+        except Exception as e:
+            logger.warning(f"Error parsing Terraform file {tf_file}: {e}")
+            return []
     
-    def _parse_terraform(self, content: str, file_path: str) -> None:
+    def _parse_terraform(self, content: _Buffer, file_path: str) -> List[_Finding]:
         """Parse Terraform content for azurerm resource definitions."""
-        # Match resource blocks: resource "azurerm_xxx" "name" {
-        resource_pattern = r'resource\s+"(azurerm_\w+)"\s+"(\w+)"\s*\{'
+        findings: List[_Finding] = []
+        line_starts = _line_starts(content)
         
-        for match in re.finditer(resource_pattern, content, re.MULTILINE):
-            tf_type = match.group(1)
-            tf_name = match.group(2)
-            line_num = content[:match.start()].count('\n') + 1
+        for match in _TF_RESOURCE_RE.finditer(content):
+            tf_type = _decode(match.group(1))
+            tf_name = _decode(match.group(2))
+            line_num = _line_of(match.start(), line_starts)
             
-            if tf_type in TERRAFORM_RESOURCE_MAP:
-                diagram_type = TERRAFORM_RESOURCE_MAP[tf_type]
+            diagram_type = TERRAFORM_RESOURCE_MAP.get(tf_type)
+            if diagram_type:
                 # Try to extract the name property
                 name = self._extract_tf_name(content, match.end(), tf_name)
-                self._add_resource(diagram_type, name, file_path, line_num)
+                findings.append((diagram_type, name, file_path, line_num))
+        
+        return findings
     
-    def _extract_tf_name(self, content: str, start_pos: int, fallback: str) -> str:
+    def _extract_tf_name(self, content: _Buffer, start_pos: int, fallback: str) -> str:
         """Extract the name property from a Terraform resource block."""
         # Find the closing brace for this resource
         search_region = content[start_pos:start_pos + 1000]
-        name_match = re.search(r'name\s*=\s*"([^"]+)"', search_region)
+        name_match = _TF_NAME_RE.search(search_region)
         if name_match:
             # Handle interpolation ${...}
-            name = name_match.group(1)
+            name = _decode(name_match.group(1))
             if '${' not in name:
                 return name
         return fallback.replace('_', ' ').title()
     
-    def _scan_arm_templates(self) -> None:
-        """Scan ARM template JSON files for resource definitions."""
-        for json_file in self.workspace_dir.rglob('*.json'):
-            if self._should_skip(json_file):
-                continue
-            
-            try:
-                content = json_file.read_text(encoding='utf-8')
-                # Check if it's an ARM template
-                if '"$schema"' in content and 'deploymentTemplate' in content.lower():
-                    data = json.loads(content)
-                    self._parse_arm_template(data, str(json_file))
-            except json.JSONDecodeError:
-                pass  # Not valid JSON, skip
-            except Exception as e:
-                logger.warning(f"Error parsing ARM template {json_file}: {e}")
+    def _scan_arm_template(self, json_file: Path) -> List[_Finding]:
+        """Scan a JSON file for ARM template resource definitions."""
+        try:
+            # Check if it's an ARM template from the first few KB only, so
+            # large unrelated JSON files (package-lock.json etc.) are never read in full
+            with open(json_file, 'rb') as f:
+                head = f.read(ARM_PROBE_BYTES)
+            if b'"$schema"' in head and b'deploymenttemplate' in head.lower():
+                data = json.loads(json_file.read_bytes())
+                return self._parse_arm_template(data, str(json_file))
+        except json.JSONDecodeError:
+            pass  # Not valid JSON, skip
+        except Exception as e:
+            logger.warning(f"Error parsing ARM template {json_file}: {e}")
+        return []
     
-    def _parse_arm_template(self, data: dict, file_path: str) -> None:
-        """Parse ARM template JSON for resources."""
-        resources = data.get('resources', [])
+    def _parse_arm_template(self, data: dict, file_path: str) -> List[_Finding]:
+        """Parse ARM template JSON for resources, including nested ones."""
+        findings: List[_Finding] = []
         
-        for resource in resources:
+        # Walk nested resources depth-first with an explicit stack; children
+        # are pushed in reverse so they are visited in document order
+        stack = list(reversed(data.get('resources') or []))
+        while stack:
+            resource = stack.pop()
             if not isinstance(resource, dict):
                 continue
             
+            # ARM types are case-insensitive; lowercase once per resource
             resource_type = resource.get('type', '').lower()
-            name = resource.get('name', 'Unknown')
+            diagram_type = AZURE_RESOURCE_TYPE_MAP.get(resource_type)
+            if diagram_type:
+                name = resource.get('name', 'Unknown')
+                # Handle ARM template expressions [...]
+                if isinstance(name, str) and name.startswith('['):
+                    name = resource_type.split('/')[-1].replace('_', ' ').title()
+                findings.append((diagram_type, name, file_path, None))
             
-            # Handle ARM template expressions [...]
-            if isinstance(name, str) and name.startswith('['):
-                name = resource_type.split('/')[-1].replace('_', ' ').title()
-            
-            if resource_type in AZURE_RESOURCE_TYPE_MAP:
-                diagram_type = AZURE_RESOURCE_TYPE_MAP[resource_type]
-                self._add_resource(diagram_type, name, file_path)
-            
-            # Recursively check nested resources
-            nested = resource.get('resources', [])
+            nested = resource.get('resources')
             if nested:
-                self._parse_arm_template({'resources': nested}, file_path)
-    
-    def _scan_code_files(self) -> None:
-        """Scan code files for Azure SDK usage patterns."""
-        code_extensions = {'.cs', '.py', '.js', '.ts', '.java'}
+                stack.extend(reversed(nested))
         
-        for ext in code_extensions:
-            for code_file in self.workspace_dir.rglob(f'*{ext}'):
-                if self._should_skip(code_file):
-                    continue
-                
-                try:
-                    content = code_file.read_text(encoding='utf-8')
-                    self._parse_code_file(content, str(code_file))
-                except Exception as e:
-                    logger.debug(f"Error parsing code file {code_file}: {e}")
+        return findings
+    
+    def _scan_code_file(self, code_file: Path) -> List[_Finding]:
+        """Scan a code file for Azure SDK usage patterns."""
+        try:
+            content = code_file.read_text(encoding='utf-8')
+            return self._parse_code_file(content, str(code_file))
+        except Exception as e:
+            logger.debug(f"Error parsing code file {code_file}: {e}")
+            return []
     
-    def _parse_code_file(self, content: str, file_path: str) -> None:
+    def _parse_code_file(self, content: str, file_path: str) -> List[_Finding]:
         """Parse code file for Azure SDK usage patterns."""
         detected_types: Set[str] = set()
         
-        for pattern, resource_type in SDK_PATTERNS.items():
-            if re.search(pattern, content, re.IGNORECASE):
+        # Each type needs only one hit, so patterns for a type that has
+        # already been detected are never searched again
+        lowered = content.lower()
+        for literal, resource_type in _SDK_LITERALS:
+            if resource_type not in detected_types and literal in lowered:
                 detected_types.add(resource_type)
         
-        for resource_type in detected_types:
-            name = f"{resource_type} (from code)"
-            self._add_resource(resource_type, name, file_path)
-    
-    def _should_skip(self, path: Path) -> bool:
-        """Check if a path should be skipped (node_modules, .git, etc.)."""
-        skip_dirs = {
-            'node_modules', '.git', '.venv', 'venv', '__pycache__',
-            'bin', 'obj', 'dist', 'build', '.terraform', '.next',
-        }
-        return any(part in skip_dirs for part in path.parts)
+        for regex, tail, resource_type in _SDK_REGEXES:
+            if resource_type in detected_types or (tail and tail not in lowered):
+                continue
+            if regex.search(content):
+                detected_types.add(resource_type)
+        
+        return [
+            (resource_type, f"{resource_type} (from code)", file_path, None)
+            for resource_type in detected_types
+        ]
     
     def _infer_connections(self) -> None:
         """Infer connections between resources based on common patterns."""
-        resource_list = list(self.resources.values())
-        
-        # Common connection patterns
-        connection_rules = [
-            # (source_type, target_type, label)
-            ('AppService', 'SQLDatabase', 'Database'),
-            ('AppService', 'CosmosDB', 'Database'),
-            ('AppService', 'Redis', 'Cache'),
-            ('AppService', 'KeyVault', 'Secrets'),
-            ('AppService', 'StorageAccount', 'Storage'),
-            ('AppService', 'BlobStorage', 'Blobs'),
-            ('AppService', 'ApplicationInsights', 'Telemetry'),
-            ('FunctionApp', 'SQLDatabase', 'Database'),
-            ('FunctionApp', 'CosmosDB', 'Database'),
-            ('FunctionApp', 'KeyVault', 'Secrets'),
-            ('FunctionApp', 'StorageAccount', 'Storage'),
-            ('FunctionApp', 'ServiceBus', 'Messages'),
-            ('FunctionApp', 'EventHub', 'Events'),
-            ('FunctionApp', 'EventGrid', 'Events'),
-            ('FunctionApp', 'ApplicationInsights', 'Telemetry'),
-            ('AKS', 'ACR', 'Pull Images'),
-            ('AKS', 'KeyVault', 'Secrets'),
-            ('AKS', 'SQLDatabase', 'Database'),
-            ('AKS', 'CosmosDB', 'Database'),
-            ('AKS', 'ApplicationInsights', 'Telemetry'),
-            ('APIM', 'AppService', 'Backend'),
-            ('APIM', 'FunctionApp', 'Backend'),
-            ('APIM', 'AKS', 'Backend'),
-            ('ApplicationGateway', 'AppService', 'Route'),
-            ('ApplicationGateway', 'AKS', 'Route'),
-            ('FrontDoor', 'AppService', 'Origin'),
-            ('FrontDoor', 'ApplicationGateway', 'Origin'),
-            ('LoadBalancer', 'VM', 'Balance'),
-            ('LoadBalancer', 'VMSS', 'Balance'),
-            ('PrivateEndpoint', 'SQLDatabase', 'Private Link'),
-            ('PrivateEndpoint', 'StorageAccount', 'Private Link'),
-            ('PrivateEndpoint', 'KeyVault', 'Private Link'),
-            ('PrivateEndpoint', 'CosmosDB', 'Private Link'),
-            ('LogicApp', 'ServiceBus', 'Messages'),
-            ('LogicApp', 'EventGrid', 'Events'),
-            ('DataFactory', 'SQLDatabase', 'Source/Sink'),
-            ('DataFactory', 'BlobStorage', 'Source/Sink'),
-            ('DataFactory', 'Synapse', 'Analytics'),
-            ('StreamAnalytics', 'EventHub', 'Input'),
-            ('StreamAnalytics', 'IoTHub', 'Input'),
-            ('StreamAnalytics', 'CosmosDB', 'Output'),
-            ('StreamAnalytics', 'SQLDatabase', 'Output'),
-        ]
-        
         # Build type-to-resources lookup
         type_lookup: Dict[str, List[str]] = {}
         for res_id, res in self.resources.items():
@@ -499,12 +716,16 @@ class WorkspaceScanner:
                 type_lookup[res.resource_type] = []
             type_lookup[res.resource_type].append(res_id)
         
-        # Apply connection rules
-        for source_type, target_type, label in connection_rules:
-            if source_type in type_lookup and target_type in type_lookup:
-                for source_id in type_lookup[source_type]:
-                    for target_id in type_lookup[target_type]:
-                        self.connections.append((source_id, target_id, label))
+        # Apply only the rules whose endpoints were both discovered
+        present = type_lookup.keys()
+        for source_type, target_type, label in CONNECTION_RULES:
+            if source_type in present and target_type in present:
+                self.connections.extend(
+                    (source_id, target_id, label)
+                    for source_id, target_id in itertools.product(
+                        type_lookup[source_type], type_lookup[target_type]
+                    )
+                )
 
 
 async def scan_workspace(
@@ -519,5 +740,7 @@ async def scan_workspace(
     Returns:
         Tuple of (discovered_resources, inferred_connections)
     """
+    # Scanning is blocking file I/O; run it off the event loop so other
+    # MCP requests are still served while a large workspace is scanned
     scanner = WorkspaceScanner(workspace_dir)
-    return scanner.scan()
+    return await asyncio.to_thread(scanner.scan)